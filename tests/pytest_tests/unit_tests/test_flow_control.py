@@ -82,8 +82,8 @@ class FlowTester:
 
     @property
     def state(self):
-        state_list = self._fc._fsm._states
-        state_obj = self._fc._fsm._state
+        state_list = self._fc._states
+        state_obj = self._fc._state
         index = state_list.index(state_obj)
         return State(index)
 
@@ -0,0 +1,93 @@
+"""proto_util lib tests."""
+
+import importlib
+import logging
+import math
+
+import pytest
+from wandb.proto import wandb_internal_pb2 as pb
+from wandb.proto import wandb_telemetry_pb2 as tpb
+from wandb.sdk.lib import json_util, proto_util
+
+
+def test_proto_encode_to_dict_telemetry():
+    telemetry = tpb.TelemetryRecord(
+        imports_init=tpb.Imports(torch=True, sklearn=True),
+        feature=tpb.Feature(watch=True, save=False, resumed=True),
+        python_version="3.11.7",
+        cli_version="0.17.0",
+        label=tpb.Labels(code_string="hello", repo_string=""),
+    )
+
+    assert proto_util.proto_encode_to_dict(telemetry) == {
+        1: [1, 5],
+        3: [1, 5],
+        4: "3.11.7",
+        5: "0.17.0",
+        9: {1: "hello"},
+    }
+
+
+def test_proto_encode_to_dict_metric():
+    metric = pb.MetricRecord(
+        name="loss",
+        step_metric="epoch",
+        options=pb.MetricOptions(step_sync=True, defined=True),
+        summary=pb.MetricSummary(min=True, last=True),
+        goal=pb.MetricRecord.GOAL_MINIMIZE,
+        _control=pb.MetricControl(overwrite=True),
+    )
+
+    assert proto_util.proto_encode_to_dict(metric) == {
+        1: "loss",
+        4: "epoch",
+        6: [1, 3],
+        7: [1, 5],
+        8: pb.MetricRecord.GOAL_MINIMIZE,
+    }
+
+
+def test_proto_encode_to_dict_empty():
+    assert proto_util.proto_encode_to_dict(tpb.TelemetryRecord()) == {}
+    assert proto_util.proto_encode_to_dict(pb.MetricRecord()) == {}
+
+
+@pytest.fixture
+def orjson_json_util(monkeypatch):
+    pytest.importorskip("orjson")
+    monkeypatch.setenv("_WANDB_ORJSON", "true")
+    importlib.reload(json_util)
+    yield json_util
+    monkeypatch.delenv("_WANDB_ORJSON")
+    importlib.reload(json_util)
+
+
+def _history_items():
+    return [
+        pb.HistoryItem(key="loss", value_json="NaN"),
+        pb.HistoryItem(key="lr", value_json="Infinity"),
+        pb.HistoryItem(key="step", value_json="3"),
+        pb.HistoryItem(nested_key=["eval", "acc"], value_json="0.5"),
+        pb.HistoryItem(nested_key=["eval", "max"], value_json="-Infinity"),
+    ]
+
+
+def _check_history_dict(result):
+    assert math.isnan(result["loss"])
+    assert result["lr"] == math.inf
+    assert result["step"] == 3
+    assert result["eval"] == {"acc": 0.5, "max": -math.inf}
+
+
+def test_dict_from_proto_list():
+    _check_history_dict(proto_util.dict_from_proto_list(_history_items()))
+
+
+def test_dict_from_proto_list_orjson_falls_back_quietly(orjson_json_util, caplog):
+    assert orjson_json_util.loads_quiet is not orjson_json_util.loads
+
+    with caplog.at_level(logging.DEBUG):
+        result = proto_util.dict_from_proto_list(_history_items())
+
+    _check_history_dict(result)
+    assert not caplog.records
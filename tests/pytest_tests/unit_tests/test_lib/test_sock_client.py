@@ -1,4 +1,13 @@
+import gc
+import select
+import socket
+import time
+import weakref
+
 import pytest
+from wandb.proto import wandb_internal_pb2 as pb
+from wandb.proto import wandb_server_pb2 as spb
+from wandb.sdk.interface import interface_sock
 from wandb.sdk.lib import sock_client
 
 
@@ -86,3 +95,193 @@ def test_get_index_error():
     assert buffer.length == 7
     with pytest.raises(IndexError):
         buffer.get(3, 8)
+
+
+@pytest.fixture
+def sock_pair():
+    sock_a, sock_b = socket.socketpair()
+    sender = sock_client.SockClient()
+    sender.set_socket(sock_a)
+    receiver = sock_client.SockClient()
+    receiver.set_socket(sock_b)
+    yield sender, receiver
+    for client in (sender, receiver):
+        if not client._closed:
+            client.close()
+
+
+def _readable(client, timeout):
+    readable, _, _ = select.select([client._sock], [], [], timeout)
+    return bool(readable)
+
+
+def test_publish_batched_keeps_order(sock_pair):
+    sender, receiver = sock_pair
+
+    sender.send_record_publish_batched(pb.Record(num=1))
+    sender.send_record_publish_batched(pb.Record(num=2))
+    # a direct send writes out the pending batch first
+    sender.send_record_publish(pb.Record(num=3))
+
+    nums = [receiver.read_server_request().record_publish.num for _ in range(3)]
+    assert nums == [1, 2, 3]
+
+
+def test_publish_batched_flushes_at_size_threshold(sock_pair):
+    sender, receiver = sock_pair
+    sender.BATCH_MAX_DELAY = 60
+    record = pb.Record(num=1)
+    frame_size = sender.HEADLEN + len(
+        spb.ServerRequest(record_publish=record).SerializeToString()
+    )
+    sender.BATCH_MAX_BYTES = frame_size * 2
+
+    sender.send_record_publish_batched(pb.Record(num=1))
+    assert not _readable(receiver, 0.05)
+    sender.send_record_publish_batched(pb.Record(num=2))
+    assert _readable(receiver, 1)
+
+    nums = [receiver.read_server_request().record_publish.num for _ in range(2)]
+    assert nums == [1, 2]
+
+
+def test_publish_batched_flushes_after_delay(sock_pair):
+    sender, receiver = sock_pair
+    sender.BATCH_MAX_DELAY = 0.01
+
+    sender.send_record_publish_batched(pb.Record(num=1))
+    assert _readable(receiver, 5)
+    assert receiver.read_server_request().record_publish.num == 1
+
+    # the flusher keeps running for later batches
+    sender.send_record_publish_batched(pb.Record(num=2))
+    assert _readable(receiver, 5)
+    assert receiver.read_server_request().record_publish.num == 2
+
+
+def test_close_flushes_batch(sock_pair):
+    sender, receiver = sock_pair
+    sender.BATCH_MAX_DELAY = 60
+
+    sender.send_record_publish_batched(pb.Record(num=1))
+    assert not _readable(receiver, 0.05)
+    sender.close()
+
+    assert receiver.read_server_request().record_publish.num == 1
+
+
+def test_publish_batched_after_close_raises(sock_pair):
+    sender, _ = sock_pair
+    sender.send_record_publish_batched(pb.Record(num=1))
+    sender.close()
+
+    with pytest.raises(sock_client.SockClientClosedError):
+        sender.send_record_publish_batched(pb.Record(num=2))
+
+
+def test_publish_batched_raises_failed_flush(sock_pair):
+    sender, receiver = sock_pair
+    sender.BATCH_MAX_DELAY = 0.01
+    receiver.close()
+
+    sender.send_record_publish_batched(pb.Record(num=1))
+    deadline = time.monotonic() + 5
+    while sender._batch_error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    with pytest.raises(OSError):
+        sender.send_record_publish_batched(pb.Record(num=2))
+
+
+def test_closed_client_is_released():
+    # not using the sock_pair fixture, which holds on to the client
+    sock_a, sock_b = socket.socketpair()
+    sender = sock_client.SockClient()
+    sender.set_socket(sock_a)
+    sender.send_record_publish_batched(pb.Record(num=1))
+    sender.close()
+    sender._batch_flusher.join(5)
+    sock_b.close()
+
+    sender_ref = weakref.ref(sender)
+    del sender
+    gc.collect()
+    assert sender_ref() is None
+
+
+class _ShortWriteSocket:
+    """Fake socket whose sendmsg() writes at most max_bytes per call."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.data = b""
+        self.calls = []
+
+    def sendmsg(self, buffers):
+        assert all(len(buf) for buf in buffers)
+        self.calls.append(len(buffers))
+        written = b"".join(bytes(buf) for buf in buffers)[: self.max_bytes]
+        self.data += written
+        return len(written)
+
+
+@pytest.mark.skipif(not sock_client._HAS_SENDMSG, reason="sendmsg not available")
+def test_sendmsg_resumes_partial_writes():
+    client = sock_client.SockClient()
+    client._sock = _ShortWriteSocket(max_bytes=4)
+
+    client._sendmsg_with_error_handle([b"abc", b"", b"defghij", b"k", b"", b"lmn"])
+
+    assert client._sock.data == b"abcdefghijklmn"
+
+
+@pytest.mark.skipif(not sock_client._HAS_SENDMSG, reason="sendmsg not available")
+def test_sendmsg_limits_buffers_per_call():
+    client = sock_client.SockClient()
+    client._sock = _ShortWriteSocket(max_bytes=10**6)
+    buffers = [b"%d," % i for i in range(sock_client._IOV_MAX * 2 + 10)]
+
+    client._sendmsg_with_error_handle(buffers)
+
+    assert client._sock.data == b"".join(buffers)
+    assert max(client._sock.calls) <= sock_client._IOV_MAX
+    assert len(client._sock.calls) == 3
+
+
+def test_publish_batched_many_records_keeps_order(sock_pair):
+    sender, receiver = sock_pair
+    sender.BATCH_MAX_DELAY = 60
+    sender.BATCH_MAX_BYTES = 10**6
+    count = sock_client._IOV_MAX // 2 + 100
+
+    for num in range(count):
+        sender.send_record_publish_batched(pb.Record(num=num))
+    sender.flush_batch()
+
+    nums = [receiver.read_server_request().record_publish.num for _ in range(count)]
+    assert nums == list(range(count))
+
+
+@pytest.mark.parametrize(
+    "record, batchable",
+    [
+        (pb.Record(history=pb.HistoryRecord()), True),
+        (pb.Record(summary=pb.SummaryRecord()), True),
+        (pb.Record(output=pb.OutputRecord()), True),
+        (
+            pb.Record(request=pb.Request(partial_history=pb.PartialHistoryRequest())),
+            True,
+        ),
+        (pb.Record(exit=pb.RunExitRecord()), False),
+        (pb.Record(run=pb.RunRecord()), False),
+        (pb.Record(request=pb.Request(keepalive=pb.KeepaliveRequest())), False),
+        (
+            pb.Record(
+                history=pb.HistoryRecord(), control=pb.Control(mailbox_slot="slot")
+            ),
+            False,
+        ),
+    ],
+)
+def test_is_batchable(record, batchable):
+    assert interface_sock._is_batchable(record) is batchable
@@ -28,6 +28,11 @@ if TYPE_CHECKING:  # pragma: no cover
         object,
     ]
 
+# Exact types that are already JSON-serializable. A set lookup on type(val)
+# is cheaper than calling val_to_json for every scalar in a history row;
+# subclasses (numpy scalars, enums, ...) still go through val_to_json.
+_JSON_SCALAR_TYPES = frozenset((int, float, str, bool))
+
 
 def history_dict_to_json(
     run: Optional["LocalRun"],
@@ -44,6 +49,8 @@ def history_dict_to_json(
     # We use list here because we were still seeing cases of RuntimeError dict changed size
     for key in list(payload):
         val = payload[key]
+        if type(val) in _JSON_SCALAR_TYPES:
+            continue
         if isinstance(val, dict):
             payload[key] = history_dict_to_json(
                 run, val, step=step, ignore_copy_err=ignore_copy_err
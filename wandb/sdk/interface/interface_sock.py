@@ -21,6 +21,22 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger("wandb")
 
+# Fire-and-forget records that may be coalesced into batched socket writes.
+# Everything else (mailbox deliveries, keepalives, control requests) is written
+# immediately, so that a broken transport raises to the caller.
+_BATCHED_RECORD_TYPES = frozenset(
+    ("history", "summary", "output", "output_raw", "stats", "telemetry", "metric")
+)
+_BATCHED_REQUEST_TYPES = frozenset(("partial_history",))
+
+
+def _is_batchable(record: "pb.Record") -> bool:
+    if record.control.mailbox_slot:
+        return False
+    if record.HasField("request"):
+        return record.request.WhichOneof("request_type") in _BATCHED_REQUEST_TYPES
+    return record.WhichOneof("record_type") in _BATCHED_RECORD_TYPES
+
 
 class InterfaceSock(InterfaceShared):
     _stream_id: Optional[str]
@@ -48,7 +64,10 @@ class InterfaceSock(InterfaceShared):
 
     def _publish(self, record: "pb.Record", local: Optional[bool] = None) -> None:
         self._assign(record)
-        self._sock_client.send_record_publish(record)
+        if _is_batchable(record):
+            self._sock_client.send_record_publish_batched(record)
+        else:
+            self._sock_client.send_record_publish(record)
 
     def _communicate_async(
         self, rec: "pb.Record", local: Optional[bool] = None
@@ -15,23 +15,22 @@ Thresholds:
     Threshold_Low_RestartSendingData       - When below this, start sending normal records
 
 State machine:
-    FORWARDING
-      -> PAUSED if should_pause
+    Each state has a dispatch function that compares the bytes outstanding to the
+    sender (behind) against the thresholds after the state's on_check.
+
+    FORWARDING (_dispatch_forwarding)
+      -> PAUSING if behind >= Threshold_High_MaxOutstandingData
          There is too much work outstanding to the sender thread, after the current request
          lets stop sending data.
-    PAUSING
-      -> FORWARDING if should_unpause
-      -> PAUSING if should_recover
-      -> PAUSING if should_quiesce
+    PAUSING (_dispatch_pausing)
+      -> FORWARDING if behind < Threshold_Low_RestartSendingData
+      -> PAUSING (recover) if behind < Threshold_Mid_StartSendingReadRequests
+      -> PAUSING (quiesce) otherwise, for local records that are not flow control
 
 """
 
 import logging
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Callable, Optional
-
-from wandb.proto import wandb_internal_pb2 as pb
-from wandb.sdk.lib import fsm
+from typing import TYPE_CHECKING, Callable, Dict, List
 
 from .settings_static import SettingsStatic
 
@@ -45,31 +44,30 @@ logger = logging.getLogger(__name__)
 DEFAULT_THRESHOLD = 128 * 1024 * 1024  # 128 MiB
 
 
-def _get_request_type(record: "Record") -> Optional[str]:
-    record_type = record.WhichOneof("record_type")
-    if record_type != "request":
-        return None
-    request_type = record.request.WhichOneof("request_type")
-    return request_type
-
-
-def _is_control_record(record: "Record") -> bool:
-    return record.control.flow_control
-
-
-def _is_local_non_control_record(record: "Record") -> bool:
-    return record.control.local and not record.control.flow_control
+class StateContext:
+    # Read and written for every record, so use slots rather than a per-instance
+    # dict. This is not a dataclass since dataclass(slots=True) needs python 3.10.
+    __slots__ = ("last_forwarded_offset", "last_sent_offset", "last_written_offset")
 
+    last_forwarded_offset: int
+    last_sent_offset: int
+    last_written_offset: int
 
-@dataclass
-class StateContext:
-    last_forwarded_offset: int = 0
-    last_sent_offset: int = 0
-    last_written_offset: int = 0
+    def __init__(
+        self,
+        last_forwarded_offset: int = 0,
+        last_sent_offset: int = 0,
+        last_written_offset: int = 0,
+    ) -> None:
+        self.last_forwarded_offset = last_forwarded_offset
+        self.last_sent_offset = last_sent_offset
+        self.last_written_offset = last_written_offset
 
 
 class FlowControl:
-    _fsm: fsm.FsmWithContext["Record", StateContext]
+    _states: List["StateShared"]
+    _state: "StateShared"
+    _dispatch: Callable[["Record"], None]
 
     def __init__(
         self,
@@ -106,73 +104,88 @@ class FlowControl:
             threshold_recover=_threshold_bytes_mid,
             threshold_forward=_threshold_bytes_low,
         )
-        self._fsm = fsm.FsmWithContext(
-            states=[state_forwarding, state_pausing],
-            table={
-                StateForwarding: [
-                    fsm.FsmEntry(
-                        state_forwarding._should_pause,
-                        StatePausing,
-                        state_forwarding._pause,
-                    ),
-                ],
-                StatePausing: [
-                    fsm.FsmEntry(
-                        state_pausing._should_unpause,
-                        StateForwarding,
-                        state_pausing._unpause,
-                    ),
-                    fsm.FsmEntry(
-                        state_pausing._should_recover,
-                        StatePausing,
-                        state_pausing._recover,
-                    ),
-                    fsm.FsmEntry(
-                        state_pausing._should_quiesce,
-                        StatePausing,
-                        state_pausing._quiesce,
-                    ),
-                ],
-            },
-        )
+
+        # The transition table is compiled into one dispatch function per
+        # state, so that each record computes the outstanding bytes once and
+        # compares it against the thresholds inline.
+        threshold_pause = state_forwarding._threshold_pause
+        threshold_recover = state_pausing._threshold_recover
+        threshold_forward = state_pausing._threshold_forward
+
+        def _dispatch_forwarding(record: "Record") -> None:
+            state_forwarding.on_check(record)
+            context = state_forwarding._context
+            behind = context.last_forwarded_offset - context.last_sent_offset
+            if behind >= threshold_pause:
+                state_forwarding._pause(record)
+                self._transition(record, state_pausing, _dispatch_pausing)
+
+        def _dispatch_pausing(record: "Record") -> None:
+            state_pausing.on_check(record)
+            context = state_pausing._context
+            behind = context.last_forwarded_offset - context.last_sent_offset
+            if behind < threshold_forward:
+                state_pausing._unpause(record)
+                self._transition(record, state_forwarding, _dispatch_forwarding)
+            elif behind < threshold_recover:
+                state_pausing._recover(record)
+            else:
+                control = record.control
+                if control.local and not control.flow_control:
+                    state_pausing._quiesce(record)
+
+        self._states = [state_forwarding, state_pausing]
+        self._state = state_forwarding
+        self._dispatch = _dispatch_forwarding
+
+    def _transition(
+        self,
+        record: "Record",
+        state: "StateShared",
+        dispatch: Callable[["Record"], None],
+    ) -> None:
+        context = self._state.on_exit(record)
+        state.on_enter(record, context)
+        self._state = state
+        self._dispatch = dispatch
 
     def flush(self) -> None:
         # TODO(mempressure): what do we do here, how do we make sure we dont have work in pause state
         pass
 
     def flow(self, record: "Record") -> None:
-        self._fsm.input(record)
+        self._dispatch(record)
 
 
 class StateShared:
+    __slots__ = ("_context",)
+
     _context: StateContext
 
     def __init__(self) -> None:
         self._context = StateContext()
 
-    def _update_written_offset(self, record: "Record") -> None:
-        end_offset = record.control.end_offset
-        if end_offset:
-            self._context.last_written_offset = end_offset
-
     def _update_forwarded_offset(self) -> None:
-        self._context.last_forwarded_offset = self._context.last_written_offset
+        context = self._context
+        context.last_forwarded_offset = context.last_written_offset
 
     def _process(self, record: "Record") -> None:
-        request_type = _get_request_type(record)
+        # callers only pass records that have a request set
+        request_type = record.request.WhichOneof("request_type")
         if not request_type:
             return
-        process_str = f"_process_{request_type}"
-        process_handler: Optional[Callable[[pb.Record], None]] = getattr(
-            self, process_str, None
-        )
+        process_handler = self._process_handlers.get(request_type)
         if not process_handler:
             return
-        process_handler(record)
+        process_handler(self, record)
 
     def _process_status_report(self, record: "Record") -> None:
-        sent_offset = record.request.status_report.sent_offset
-        self._context.last_sent_offset = sent_offset
+        self._context.last_sent_offset = record.request.status_report.sent_offset
+
+    # request type -> handler, built once instead of a getattr per record
+    _process_handlers: Dict[str, Callable[["StateShared", "Record"], None]] = {
+        "status_report": _process_status_report,
+    }
 
     def on_exit(self, record: "Record") -> StateContext:
         return self._context
@@ -180,12 +193,10 @@ class StateShared:
     def on_enter(self, record: "Record", context: StateContext) -> None:
         self._context = context
 
-    @property
-    def _behind_bytes(self) -> int:
-        return self._context.last_forwarded_offset - self._context.last_sent_offset
-
 
 class StateForwarding(StateShared):
+    __slots__ = ("_forward_record", "_pause_marker", "_threshold_pause")
+
     _forward_record: Callable[["Record"], None]
     _pause_marker: Callable[[], None]
     _threshold_pause: int
@@ -201,21 +212,30 @@ class StateForwarding(StateShared):
         self._pause_marker = pause_marker
         self._threshold_pause = threshold_pause
 
-    def _should_pause(self, record: "Record") -> bool:
-        return self._behind_bytes >= self._threshold_pause
-
     def _pause(self, record: "Record") -> None:
         self._pause_marker()
 
     def on_check(self, record: "Record") -> None:
-        self._update_written_offset(record)
-        self._process(record)
-        if not _is_control_record(record):
+        control = record.control
+        context = self._context
+        end_offset = control.end_offset
+        if end_offset:
+            context.last_written_offset = end_offset
+        if record.HasField("request"):
+            self._process(record)
+        if not control.flow_control:
             self._forward_record(record)
-        self._update_forwarded_offset()
+        context.last_forwarded_offset = context.last_written_offset
 
 
 class StatePausing(StateShared):
+    __slots__ = (
+        "_forward_record",
+        "_recover_records",
+        "_threshold_recover",
+        "_threshold_forward",
+    )
+
     _forward_record: Callable[["Record"], None]
     _recover_records: Callable[[int, int], None]
     _threshold_recover: int
@@ -234,30 +254,26 @@ class StatePausing(StateShared):
         self._threshold_recover = threshold_recover
         self._threshold_forward = threshold_forward
 
-    def _should_unpause(self, record: "Record") -> bool:
-        return self._behind_bytes < self._threshold_forward
-
     def _unpause(self, record: "Record") -> None:
         self._quiesce(record)
 
-    def _should_recover(self, record: "Record") -> bool:
-        return self._behind_bytes < self._threshold_recover
-
     def _recover(self, record: "Record") -> None:
         self._quiesce(record)
 
-    def _should_quiesce(self, record: "Record") -> bool:
-        return _is_local_non_control_record(record)
-
     def _quiesce(self, record: "Record") -> None:
-        start = self._context.last_forwarded_offset
-        end = self._context.last_written_offset
+        context = self._context
+        start = context.last_forwarded_offset
+        end = context.last_written_offset
         if start != end:
             self._recover_records(start, end)
-        if _is_local_non_control_record(record):
+        control = record.control
+        if control.local and not control.flow_control:
             self._forward_record(record)
         self._update_forwarded_offset()
 
     def on_check(self, record: "Record") -> None:
-        self._update_written_offset(record)
-        self._process(record)
+        end_offset = record.control.end_offset
+        if end_offset:
+            self._context.last_written_offset = end_offset
+        if record.HasField("request"):
+            self._process(record)
@@ -1,11 +1,27 @@
 from dataclasses import fields
-from typing import Any, Iterable, Sequence, Tuple
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
 
 from wandb.proto import wandb_settings_pb2
 from wandb.sdk.lib import RunMoment
 from wandb.sdk.wandb_settings import SettingsData
 
 
+def _value_converter(field_type: Any) -> Optional[Callable[[Any], Any]]:
+    if field_type == Sequence[str]:
+        return list
+    if field_type == Tuple[str]:
+        return tuple
+    return None
+
+
+# Field names of SettingsData mapped to the converter applied to their proto
+# value. Computed once, so that building a SettingsStatic does not compare
+# typing annotations for every field.
+_FIELD_CONVERTERS: Dict[str, Optional[Callable[[Any], Any]]] = {
+    field.name: _value_converter(field.type) for field in fields(SettingsData)
+}
+
+
 class SettingsStatic(SettingsData):
     """A readonly object that wraps a protobuf Settings message.
 
@@ -19,8 +35,7 @@ class SettingsStatic(SettingsData):
 
     def _from_proto(self, proto: wandb_settings_pb2.Settings) -> None:
         forks_specified: list[str] = []
-        for field in fields(SettingsData):
-            key = field.name
+        for key, converter in _FIELD_CONVERTERS.items():
             value: Any = None
             if key == "_stats_open_metrics_filters":
                 # todo: it's an underscored field, refactor into
@@ -52,10 +67,8 @@ class SettingsStatic(SettingsData):
             else:
                 if proto.HasField(key):  # type: ignore [arg-type]
                     value = getattr(proto, key).value
-                    if field.type == Sequence[str]:
-                        value = list(value)
-                    elif field.type == Tuple[str]:
-                        value = tuple(value)
+                    if converter:
+                        value = converter(value)
                 else:
                     value = None
             object.__setattr__(self, key, value)
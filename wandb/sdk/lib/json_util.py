@@ -58,6 +58,18 @@ try:
 
             return decoded
 
+        def loads_quiet(obj: Union[str, bytes]) -> Any:
+            """Wrapper for orjson.loads that falls back to json.loads without logging.
+
+            Use for values that may contain NaN or Infinity, which orjson rejects.
+            """
+            try:
+                decoded = orjson.loads(obj)
+            except orjson.JSONDecodeError:
+                decoded = json.loads(obj)
+
+            return decoded
+
         def load(fp: Any) -> Any:
             """Wrapper for orjson.load."""
             try:
@@ -75,6 +87,8 @@ try:
             load,
             loads,
         )
+        from json import loads as loads_quiet  # type: ignore[assignment] # noqa: F401
 
 except ImportError:
     from json import dump, dumps, load, loads  # type: ignore[assignment] # noqa: F401
+    from json import loads as loads_quiet  # type: ignore[assignment] # noqa: F401
@@ -1,10 +1,15 @@
 #
-import json
+import functools
 from typing import TYPE_CHECKING, Any, Dict, Union
 
+from google.protobuf.descriptor import FieldDescriptor
+
 from wandb.proto import wandb_internal_pb2 as pb
 
+from . import json_util
+
 if TYPE_CHECKING:  # pragma: no cover
+    from google.protobuf.descriptor import Descriptor
     from google.protobuf.internal.containers import RepeatedCompositeFieldContainer
     from google.protobuf.message import Message
 
@@ -13,6 +18,8 @@ if TYPE_CHECKING:  # pragma: no cover
 
 def dict_from_proto_list(obj_list: "RepeatedCompositeFieldContainer") -> Dict[str, Any]:
     result: Dict[str, Any] = {}
+    # NaN and Infinity values are expected here, so orjson failures are not logged
+    loads = json_util.loads_quiet
 
     for item in obj_list:
         # Start from the root of the result dict
@@ -31,7 +38,7 @@ def dict_from_proto_list(obj_list: "RepeatedCompositeFieldContainer") -> Dict[st
 
         # Set the value at the final key location, parsing JSON from the value_json field
         final_key = keys[-1]
-        current_level[final_key] = json.loads(item.value_json)
+        current_level[final_key] = loads(item.value_json)
 
     return result
 
@@ -49,23 +56,62 @@ def _assign_end_offset(record: "pb.Record", end_offset: int) -> None:
     record.control.end_offset = end_offset
 
 
+_TYPE_BOOL = FieldDescriptor.TYPE_BOOL
+_TYPE_ENUM = FieldDescriptor.TYPE_ENUM
+_TYPE_INT32 = FieldDescriptor.TYPE_INT32
+_TYPE_MESSAGE = FieldDescriptor.TYPE_MESSAGE
+_TYPE_STRING = FieldDescriptor.TYPE_STRING
+
+# how proto_encode_to_dict encodes a field
+_ENCODE_VALUE = 0
+_ENCODE_BOOL_MESSAGE = 1
+_ENCODE_MESSAGE = 2
+
+
+@functools.lru_cache(maxsize=None)
+def _encoded_field_kinds(descriptor: "Descriptor") -> Dict[int, int]:
+    """Map field numbers encoded by proto_encode_to_dict to how they are encoded.
+
+    Descriptors are static per message class, so this is computed once per type.
+    Fields that are private (prefixed with "_") or of an unsupported type are left
+    out of the mapping and skipped by the encoder.
+    """
+    kinds: Dict[int, int] = {}
+    for desc in descriptor.fields:
+        if desc.name.startswith("_"):
+            continue
+        if desc.type in (_TYPE_STRING, _TYPE_INT32, _TYPE_ENUM):
+            kinds[desc.number] = _ENCODE_VALUE
+        elif desc.type == _TYPE_MESSAGE:
+            assert desc.message_type is not None
+            nested_fields = desc.message_type.fields
+            if all(d.type == _TYPE_BOOL for d in nested_fields):
+                kinds[desc.number] = _ENCODE_BOOL_MESSAGE
+            else:
+                kinds[desc.number] = _ENCODE_MESSAGE
+    return kinds
+
+
 def proto_encode_to_dict(
     pb_obj: Union["tpb.TelemetryRecord", "pb.MetricRecord"],
 ) -> Dict[int, Any]:
     data: Dict[int, Any] = dict()
+    kinds = _encoded_field_kinds(pb_obj.DESCRIPTOR)
     fields = pb_obj.ListFields()
     for desc, value in fields:
-        if desc.name.startswith("_"):
+        kind = kinds.get(desc.number)
+        if kind is None:
             continue
-        if desc.type == desc.TYPE_STRING:
+        if kind == _ENCODE_VALUE:
             data[desc.number] = value
-        elif desc.type == desc.TYPE_INT32:
-            data[desc.number] = value
-        elif desc.type == desc.TYPE_ENUM:
-            data[desc.number] = value
-        elif desc.type == desc.TYPE_MESSAGE:
+        elif kind == _ENCODE_BOOL_MESSAGE:
+            # only fields set to True are listed
+            items = [d.number for d, _ in value.ListFields()]
+            if items:
+                data[desc.number] = items
+        else:
             nested = value.ListFields()
-            bool_msg = all(d.type == d.TYPE_BOOL for d, _ in nested)
+            bool_msg = all(d.type == _TYPE_BOOL for d, _ in nested)
             if bool_msg:
                 items = [d.number for d, v in nested if v]
                 if items:
@@ -74,7 +120,7 @@ def proto_encode_to_dict(
                 # TODO: for now this code only handles sub-messages with strings
                 md = {}
                 for d, v in nested:
-                    if not v or d.type != d.TYPE_STRING:
+                    if not v or d.type != _TYPE_STRING:
                         continue
                     md[d.number] = v
                 data[desc.number] = md
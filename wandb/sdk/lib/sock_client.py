@@ -1,8 +1,11 @@
+import multiprocessing.util
+import os
 import socket
 import struct
 import threading
 import time
 import uuid
+import weakref
 from typing import TYPE_CHECKING, Any, List, Optional
 
 from wandb.proto import wandb_server_pb2 as spb
@@ -12,6 +15,34 @@ from . import tracelog
 if TYPE_CHECKING:
     from wandb.proto import wandb_internal_pb2 as pb
 
+# vectored writes are not available on all platforms (e.g. Windows)
+_HAS_SENDMSG = hasattr(socket.socket, "sendmsg")
+# maximum number of buffers passed to a single sendmsg() call
+_IOV_MAX = 1024
+
+# clients with a batching flusher, reset in forked children
+_batching_clients: "weakref.WeakSet[SockClient]" = weakref.WeakSet()
+
+
+def _flush_batch_at_exit(client_ref: "weakref.ref[SockClient]") -> None:
+    client = client_ref()
+    if client is None:
+        return
+    try:
+        client.flush_batch()
+    except (SockClientClosedError, OSError):
+        pass
+
+
+def _reset_batching_clients_after_fork() -> None:
+    for client in list(_batching_clients):
+        client._reset_batch_after_fork()
+
+
+# os.register_at_fork is not available on all platforms (e.g. Windows)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_batching_clients_after_fork)
+
 
 class SockClientClosedError(Exception):
     """Socket has been closed."""
@@ -85,17 +116,41 @@ class SockClient:
     _lock: "threading.Lock"
     _bufsize: int
     _buffer: SockBuffer
+    _batch: List[bytes]
+    _batch_size: int
+    _batch_deadline: float
+    _batch_error: Optional[Exception]
+    _batch_cond: "threading.Condition"
+    _batch_flusher: Optional[threading.Thread]
+    _batch_finalizer: Optional[multiprocessing.util.Finalize]
+    _closed: bool
 
     # current header is magic byte "W" followed by 4 byte length of the message
     HEADLEN = 1 + 4
 
+    # batched publish records are written once this many bytes are pending,
+    # or at the latest after this many seconds
+    BATCH_MAX_BYTES = 64 * 1024
+    BATCH_MAX_DELAY = 0.005
+
     def __init__(self) -> None:
         # TODO: use safe uuid's (python3.7+) or emulate this
         self._sockid = uuid.uuid4().hex
         self._retry_delay = 0.1
-        self._lock = threading.Lock()
         self._bufsize = 4096
         self._buffer = SockBuffer()
+        self._closed = False
+        self._init_batch()
+
+    def _init_batch(self) -> None:
+        self._lock = threading.Lock()
+        self._batch_cond = threading.Condition(self._lock)
+        self._batch = []
+        self._batch_size = 0
+        self._batch_deadline = 0.0
+        self._batch_error = None
+        self._batch_flusher = None
+        self._batch_finalizer = None
 
     def connect(self, port: int) -> None:
         s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -109,6 +164,16 @@ class SockClient:
         self._bufsize = min(sndbuf_size, rcvbuf_size, 65536)
 
     def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._batch_cond.notify()
+        try:
+            self.flush_batch()
+        except (SockClientClosedError, OSError):
+            pass
+        if self._batch_finalizer:
+            self._batch_finalizer.cancel()
+            self._batch_finalizer = None
         self._sock.close()
 
     def shutdown(self, val: int) -> None:
@@ -142,14 +207,130 @@ class SockClient:
                 if delta_time < self._retry_delay:
                     time.sleep(self._retry_delay - delta_time)
 
-    def _send_message(self, msg: Any) -> None:
+    def _sendmsg_with_error_handle(self, buffers: List[bytes]) -> None:
+        # Same as _sendall_with_error_handle(), but writes the buffers with
+        # vectored sendmsg() calls instead of concatenating them first.
+        views = [memoryview(buf) for buf in buffers if buf]
+        while views:
+            start_time = time.monotonic()
+            try:
+                sent = self._sock.sendmsg(views[:_IOV_MAX])
+                # sent equal to 0 indicates a closed socket
+                if sent == 0:
+                    raise SockClientClosedError("socket connection broken")
+                # drop the buffers that were fully sent, trim a partial one
+                index = 0
+                while sent and sent >= len(views[index]):
+                    sent -= len(views[index])
+                    index += 1
+                views = views[index:]
+                if sent:
+                    views[0] = views[0][sent:]
+            # we handle the timeout case for the cases when timeout is set
+            # on a system level by another application
+            except socket.timeout:
+                # adding sleep to avoid tight loop
+                delta_time = time.monotonic() - start_time
+                if delta_time < self._retry_delay:
+                    time.sleep(self._retry_delay - delta_time)
+
+    def _send_buffers(self, buffers: List[bytes]) -> None:
+        # caller must hold self._lock
+        if _HAS_SENDMSG:
+            self._sendmsg_with_error_handle(buffers)
+        else:
+            self._sendall_with_error_handle(b"".join(buffers))
+
+    def _frame_message(self, msg: Any) -> List[bytes]:
         tracelog.log_message_send(msg, self._sockid)
-        raw_size = msg.ByteSize()
         data = msg.SerializeToString()
-        assert len(data) == raw_size, "invalid serialization"
-        header = struct.pack("<BI", ord("W"), raw_size)
+        header = struct.pack("<BI", ord("W"), len(data))
+        return [header, data]
+
+    def _take_batch_locked(self) -> List[bytes]:
+        # caller must hold self._lock
+        buffers = self._batch
+        self._batch = []
+        self._batch_size = 0
+        return buffers
+
+    def _raise_batch_error_locked(self) -> None:
+        # caller must hold self._lock
+        # a failed background flush is reported by the next send on this client
+        error = self._batch_error
+        if error:
+            self._batch_error = None
+            raise error
+
+    def _flush_batch_locked(self) -> None:
+        # caller must hold self._lock
+        buffers = self._take_batch_locked()
+        if buffers:
+            self._send_buffers(buffers)
+
+    def _batch_flusher_loop(self) -> None:
+        with self._batch_cond:
+            while not self._closed:
+                if not self._batch:
+                    self._batch_cond.wait()
+                    continue
+                remaining = self._batch_deadline - time.monotonic()
+                if remaining > 0:
+                    self._batch_cond.wait(remaining)
+                    continue
+                try:
+                    self._flush_batch_locked()
+                except (SockClientClosedError, OSError) as e:
+                    self._batch_error = e
+
+    def _start_batch_flusher_locked(self) -> None:
+        # caller must hold self._lock
+        flusher = threading.Thread(
+            target=self._batch_flusher_loop, name="SockClientFlusher", daemon=True
+        )
+        flusher.start()
+        self._batch_flusher = flusher
+        _batching_clients.add(self)
+        # finalizers with an exit priority run at interpreter exit, and also in
+        # multiprocessing workers, which leave through os._exit()
+        self._batch_finalizer = multiprocessing.util.Finalize(
+            self, _flush_batch_at_exit, args=(weakref.ref(self),), exitpriority=0
+        )
+
+    def _reset_batch_after_fork(self) -> None:
+        # the flusher thread does not exist in a forked child, and the pending
+        # batch belongs to the parent, which still writes it out
+        self._init_batch()
+
+    def flush_batch(self) -> None:
+        """Write out all pending batched messages."""
         with self._lock:
-            self._sendall_with_error_handle(header + data)
+            self._raise_batch_error_locked()
+            self._flush_batch_locked()
+
+    def _send_message(self, msg: Any) -> None:
+        frame = self._frame_message(msg)
+        with self._lock:
+            self._raise_batch_error_locked()
+            # previously batched messages go out first, in the same write
+            self._send_buffers(self._take_batch_locked() + frame)
+
+    def _send_message_batched(self, msg: Any) -> None:
+        frame = self._frame_message(msg)
+        with self._lock:
+            if self._closed:
+                raise SockClientClosedError("socket has been closed")
+            self._raise_batch_error_locked()
+            was_empty = not self._batch
+            self._batch.extend(frame)
+            self._batch_size += len(frame[0]) + len(frame[1])
+            if self._batch_size >= self.BATCH_MAX_BYTES:
+                self._flush_batch_locked()
+            elif was_empty:
+                self._batch_deadline = time.monotonic() + self.BATCH_MAX_DELAY
+                if not self._batch_flusher:
+                    self._start_batch_flusher_locked()
+                self._batch_cond.notify()
 
     def send_server_request(self, msg: Any) -> None:
         self._send_message(msg)
@@ -220,6 +401,21 @@ class SockClient:
         server_req.record_publish.CopyFrom(record)
         self.send_server_request(server_req)
 
+    def send_record_publish_batched(self, record: "pb.Record") -> None:
+        """Publish a record, coalescing it with other records into a single write.
+
+        Pending records are written when BATCH_MAX_BYTES is reached, after
+        BATCH_MAX_DELAY seconds, before any other message is sent, on close()
+        and at interpreter exit. A failed background write is raised by the
+        next send.
+
+        Raises:
+            SockClientClosedError: the client has been closed.
+        """
+        server_req = spb.ServerRequest()
+        server_req.record_publish.CopyFrom(record)
+        self._send_message_batched(server_req)
+
     def _extract_packet_bytes(self) -> Optional[bytes]:
         # Do we have enough data to read the header?
         start_offset = self.HEADLEN
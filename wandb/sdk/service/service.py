@@ -46,6 +46,12 @@ class ServiceStartPortError(Error):
     pass
 
 
+# The port file is polled with an exponential backoff, starting short so that
+# a service that comes up quickly does not wait out a full polling interval.
+_PORT_FILE_POLL_MIN = 0.01
+_PORT_FILE_POLL_MAX = 0.2
+
+
 class _Service:
     _settings: "Settings"
     _sock_port: Optional[int]
@@ -90,6 +96,7 @@ class _Service:
 
         """
         time_max = time.monotonic() + self._settings._service_wait
+        poll_delay = _PORT_FILE_POLL_MIN
         while time.monotonic() < time_max:
             if proc and proc.poll():
                 # process finished
@@ -115,13 +122,15 @@ class _Service:
                     context=context,
                 )
             if not os.path.isfile(fname):
-                time.sleep(0.2)
+                time.sleep(poll_delay)
+                poll_delay = min(poll_delay * 2, _PORT_FILE_POLL_MAX)
                 continue
             try:
                 pf = port_file.PortFile()
                 pf.read(fname)
                 if not pf.is_valid:
-                    time.sleep(0.2)
+                    time.sleep(poll_delay)
+                    poll_delay = min(poll_delay * 2, _PORT_FILE_POLL_MAX)
                     continue
                 self._sock_port = pf.sock_port
             except Exception as e:
@@ -32,20 +32,24 @@ class ServiceSockInterface(ServiceInterface):
     def _svc_inform_init(
         self, settings: "wandb_settings_pb2.Settings", run_id: str
     ) -> None:
-        inform_init = spb.ServerInformInitRequest()
+        # fill in the request inside its envelope so that the (large) settings
+        # message is copied once, rather than again by SockClient.send()
+        server_req = spb.ServerRequest()
+        inform_init = server_req.inform_init
         inform_init.settings.CopyFrom(settings)
         inform_init._info.stream_id = run_id
         assert self._sock_client
-        self._sock_client.send(inform_init=inform_init)
+        self._sock_client.send_server_request(server_req)
 
     def _svc_inform_start(
         self, settings: "wandb_settings_pb2.Settings", run_id: str
     ) -> None:
-        inform_start = spb.ServerInformStartRequest()
+        server_req = spb.ServerRequest()
+        inform_start = server_req.inform_start
         inform_start.settings.CopyFrom(settings)
         inform_start._info.stream_id = run_id
         assert self._sock_client
-        self._sock_client.send(inform_start=inform_start)
+        self._sock_client.send_server_request(server_req)
 
     def _svc_inform_finish(self, run_id: Optional[str] = None) -> None:
         assert run_id